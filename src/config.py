@@ -9,3 +9,17 @@ INPUT_DIR_DEFAULT = os.getenv("INPUT_DIR", "lerpdf")
 OUTPUT_DIR_DEFAULT = os.getenv("OUTPUT_DIR", "out")
 MAX_QUEST_PER_BLOCK = int(os.getenv("MAX_QUEST_PER_BLOCK", "30"))
 RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
+
+# Roteamento multi-chave / multi-modelo (listas separadas por vírgula)
+GEMINI_API_KEYS = [k.strip() for k in os.getenv("GEMINI_API_KEYS", GEMINI_API_KEY).split(",") if k.strip()]
+GEMINI_MODELS_FAST = [m.strip() for m in os.getenv("GEMINI_MODELS_FAST", GEMINI_MODEL).split(",") if m.strip()]
+GEMINI_MODELS_STRONG = [m.strip() for m in os.getenv("GEMINI_MODELS_STRONG", GEMINI_MODEL).split(",") if m.strip()]
+GEMINI_BASE_URLS = [u.strip().rstrip("/") for u in os.getenv("GEMINI_BASE_URLS", "https://generativelanguage.googleapis.com/v1beta").split(",") if u.strip()]
+ROUTER_SHORT_CHARS = int(os.getenv("ROUTER_SHORT_CHARS", "400"))
+ROUTER_COOLDOWN_SECONDS = float(os.getenv("ROUTER_COOLDOWN_SECONDS", "30"))
+
+# Hedging: duplica a requisição que passar do percentil de latência (opcional)
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "0").strip().lower() in {"1", "true", "yes", "sim"}
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_WINDOW = int(os.getenv("HEDGE_WINDOW", "200"))
@@ -4,13 +4,12 @@ import os
 from typing import List, Dict, Any
 
 from tenacity import retry, wait_exponential, stop_after_attempt
-from ratelimit import limits, sleep_and_retry
-import requests
 from pathlib import Path
 
-from .config import GEMINI_API_KEY, GEMINI_MODEL, RATE_LIMIT_PER_MINUTE
+from .config import GEMINI_API_KEYS
+from .router import GeminiRouter, TIER_STRONG
 
-if not GEMINI_API_KEY:
+if not GEMINI_API_KEYS:
 	raise RuntimeError("GEMINI_API_KEY não definida. Use .env ou variável de ambiente.")
 
 ANSWER_MODE = os.getenv("ANSWER_MODE", "fa").lower().strip()
@@ -67,7 +66,8 @@ if ANSWER_MODE == "qa":
 else:
 	SYSTEM_PROMPT = SYSTEM_PROMPT_BASE_FA + ("\n\nEXEMPLO DE FORMATO JFLAP (SIGA EXATAMENTE O FORMATO):\n" + FORMAT_EXAMPLE if FORMAT_EXAMPLE else "")
 
-API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
+# Roteador com limitador e saúde por endpoint (substitui o limite global por minuto)
+ROUTER = GeminiRouter.from_config()
 
 
 def _extract_json_from_text(text: str) -> Dict[str, Any]:
@@ -94,8 +94,6 @@ def _extract_json_from_text(text: str) -> Dict[str, Any]:
 	return {"questoes": []}
 
 
-@sleep_and_retry
-@limits(calls=RATE_LIMIT_PER_MINUTE, period=60)
 @retry(wait=wait_exponential(multiplier=1, min=1, max=30), stop=stop_after_attempt(5))
 def extract_with_gemini(block_text: str) -> Dict[str, Any]:
 	# Monta o prompt considerando o modo QA (com PROMPT_DO_USUÁRIO) ou FA
@@ -117,13 +115,8 @@ def extract_with_gemini(block_text: str) -> Dict[str, Any]:
 			}
 		]
 	}
-	headers = {
-		"Content-Type": "application/json",
-		"X-goog-api-key": GEMINI_API_KEY,
-	}
-	resp = requests.post(API_URL, headers=headers, data=json.dumps(payload), timeout=120)
-	resp.raise_for_status()
-	data = resp.json()
+	tier = GeminiRouter.choose_tier(block_text, ANSWER_MODE)
+	data = ROUTER.post(payload, tier=tier, timeout=120, kind=f"extract_{tier}")
 	candidates = data.get("candidates", [])
 	if not candidates:
 		return {"questoes": []}
@@ -134,8 +127,6 @@ def extract_with_gemini(block_text: str) -> Dict[str, Any]:
 	return _extract_json_from_text(text)
 
 
-@sleep_and_retry
-@limits(calls=RATE_LIMIT_PER_MINUTE, period=60)
 @retry(wait=wait_exponential(multiplier=1, min=1, max=30), stop=stop_after_attempt(5))
 def segment_text_into_questions(full_text: str) -> Dict[str, Any]:
 	prompt = f"{SEGMENT_PROMPT}\n\nTEXTO COMPLETO:\n\n{full_text}\n"
@@ -148,13 +139,7 @@ def segment_text_into_questions(full_text: str) -> Dict[str, Any]:
 			}
 		]
 	}
-	headers = {
-		"Content-Type": "application/json",
-		"X-goog-api-key": GEMINI_API_KEY,
-	}
-	resp = requests.post(API_URL, headers=headers, data=json.dumps(payload), timeout=180)
-	resp.raise_for_status()
-	data = resp.json()
+	data = ROUTER.post(payload, tier=TIER_STRONG, timeout=180, kind="segment")
 	candidates = data.get("candidates", [])
 	if not candidates:
 		return {"questoes": []}
@@ -0,0 +1,146 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class LatencyTracker:
+	"""Guarda as latências recentes (janela deslizante) por tipo de chamada."""
+
+	def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+		self.window = window
+		self.min_samples = min_samples
+		self._samples: Dict[str, Deque[float]] = {}
+		self._lock = threading.Lock()
+
+	def record(self, kind: str, seconds: float) -> None:
+		with self._lock:
+			self._samples.setdefault(kind, deque(maxlen=self.window)).append(seconds)
+
+	def percentile(self, kind: str, pct: float) -> Optional[float]:
+		"""Percentil (nearest-rank) das latências de `kind`; None se ainda houver poucas amostras."""
+		with self._lock:
+			samples = sorted(self._samples.get(kind, ()))
+		if len(samples) < self.min_samples:
+			return None
+		rank = max(1, math.ceil(pct / 100.0 * len(samples)))
+		return samples[rank - 1]
+
+
+def _spawn(fn: Callable[..., Any], *args: Any) -> Future:
+	"""Executa `fn` numa thread daemon: perdedores presos no timeout não seguram a fila nem a saída."""
+	fut: Future = Future()
+
+	def runner() -> None:
+		if not fut.set_running_or_notify_cancel():
+			return
+		try:
+			fut.set_result(fn(*args))
+		except BaseException as e:
+			fut.set_exception(e)
+
+	threading.Thread(target=runner, name="hedge", daemon=True).start()
+	return fut
+
+
+class Hedger:
+	"""Dispara uma requisição duplicada quando a original passa do percentil configurado.
+
+	A primeira a terminar com sucesso vence; a outra é cancelada (não tenta novos endpoints
+	e seu resultado é descartado). A requisição HTTP já em andamento não pode ser abortada,
+	então ela termina em segundo plano numa thread daemon. Enquanto a original perdedora não
+	termina, `stats()` conta como economia o tempo que ela já passou além do hedge.
+	"""
+
+	def __init__(self, tracker: LatencyTracker, pct: float = 95.0) -> None:
+		self.tracker = tracker
+		self.pct = pct
+		self._lock = threading.Lock()
+		self.counters: Dict[str, float] = {
+			"calls": 0,
+			"hedges_fired": 0,
+			"hedges_won": 0,
+			"hedges_skipped_budget": 0,
+			"saved_seconds": 0.0,
+		}
+		# Originais que perderam para o hedge e ainda estão em andamento
+		self._losers: List[Dict[str, float]] = []
+
+	def _bump(self, name: str, value: float = 1) -> None:
+		with self._lock:
+			self.counters[name] += value
+
+	def stats(self) -> Dict[str, float]:
+		now = time.monotonic()
+		with self._lock:
+			st = dict(self.counters)
+			for loser in self._losers:
+				st["saved_seconds"] += max(0.0, now - loser["start"] - loser["hedge_won_at"])
+			st["hedges_pending"] = len(self._losers)
+		return st
+
+	def run(
+		self,
+		kind: str,
+		primary: Callable[[threading.Event], Any],
+		make_hedge: Callable[[], Optional[Callable[[threading.Event], Any]]],
+	) -> Any:
+		"""Executa `primary`; se passar do limiar, pede a `make_hedge` uma cópia (None = sem cota)."""
+		self._bump("calls")
+		primary_cancel = threading.Event()
+		state: Dict[str, float] = {"start": time.monotonic()}
+
+		def timed_primary(cancel: threading.Event) -> Any:
+			# Mede a partir do início real da execução
+			state["start"] = time.monotonic()
+			try:
+				return primary(cancel)
+			finally:
+				elapsed = time.monotonic() - state["start"]
+				# Toda original alimenta o percentil, inclusive as que falharam ou estouraram o
+				# timeout (justamente a cauda); se o hedge venceu, a economia é fechada aqui
+				self.tracker.record(kind, elapsed)
+				with self._lock:
+					state["done"] = 1.0
+					if "hedge_won_at" in state:
+						self.counters["saved_seconds"] += max(0.0, elapsed - state["hedge_won_at"])
+						self._losers = [l for l in self._losers if l is not state]
+
+		fut_p = _spawn(timed_primary, primary_cancel)
+
+		threshold = self.tracker.percentile(kind, self.pct)
+		if threshold is None:
+			return fut_p.result()
+		done, _ = wait([fut_p], timeout=threshold)
+		if done:
+			return fut_p.result()
+
+		hedge = make_hedge()
+		if hedge is None:
+			self._bump("hedges_skipped_budget")
+			return fut_p.result()
+		self._bump("hedges_fired")
+		hedge_cancel = threading.Event()
+		fut_h = _spawn(hedge, hedge_cancel)
+
+		pending = {fut_p, fut_h}
+		while pending:
+			done, pending = wait(pending, return_when=FIRST_COMPLETED)
+			# Se ambas terminaram juntas, a original tem preferência
+			for f in sorted(done, key=lambda f: f is fut_h):
+				if f.exception() is not None:
+					continue
+				if f is fut_h:
+					with self._lock:
+						self.counters["hedges_won"] += 1
+						if "done" not in state:
+							state["hedge_won_at"] = time.monotonic() - state["start"]
+							self._losers.append(state)
+					primary_cancel.set()
+				else:
+					hedge_cancel.set()
+				return f.result()
+		# Ambas falharam: propaga o erro da original
+		return fut_p.result()
@@ -1,13 +1,14 @@
 import argparse
 import json
 import os
+import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from .config import INPUT_DIR_DEFAULT, OUTPUT_DIR_DEFAULT, MAX_QUEST_PER_BLOCK
 from .extractor import extract_text
-from .gemini_client import extract_with_gemini, merge_blocks, segment_text_into_questions
 from .jff_converter import write_mealy_jff_file, write_fa_jff_file
+from .results_store import ResultsStore, exam_hash
 
 
 STATUS_FILE = "status.json"
@@ -32,15 +33,27 @@ def _sanitize_id(raw_id: str) -> str:
 	return s
 
 
-def _write_per_question_outputs(stem: str, out_dir: Path, q: Dict[str, Any], jff_type: str, solved_subdir: str) -> None:
+def _write_per_question_outputs(
+	stem: str,
+	out_dir: Path,
+	q: Dict[str, Any],
+	jff_type: str,
+	solved_subdir: str,
+	store: Optional[ResultsStore] = None,
+	exam: str = "",
+	answer_mode: str = ANSWER_MODE,
+) -> None:
 	qid = _sanitize_id(q.get("id") or "Q")
 	base = f"{stem}_{qid}"
+	# Registro no NDJSON indexado (omitido ao regenerar os arquivos a partir dele)
+	if store is not None:
+		store.append(exam, stem, qid, q, mode=answer_mode, jff_type=jff_type)
 	alts = q.get("alternativas", [])
 	correta = q.get("correta") or ""
 	exp = q.get("explicacao") or ""
 	# TXT
 	# Em modo QA, salvar TXT por questão dentro de out/solved_subdir
-	if ANSWER_MODE == "qa":
+	if answer_mode == "qa":
 		solved_dir = out_dir / solved_subdir
 		solved_dir.mkdir(parents=True, exist_ok=True)
 		txt_path = solved_dir / f"{base}.txt"
@@ -62,7 +75,7 @@ def _write_per_question_outputs(stem: str, out_dir: Path, q: Dict[str, Any], jff
 	json_path = out_dir / f"{base}.json"
 	json_path.write_text(json.dumps(q, ensure_ascii=False, indent=2), encoding="utf-8")
 	# JFF por questão (apenas quando NÃO estiver em modo QA)
-	if ANSWER_MODE != "qa":
+	if answer_mode != "qa":
 		solved_dir = out_dir / solved_subdir
 		solved_dir.mkdir(parents=True, exist_ok=True)
 		jff_path = solved_dir / f"{base}.jff"
@@ -91,6 +104,11 @@ def process_file(file_path: Path, out_dir: Path, jff_type: str = "fa", refresh:
 	status = load_status(out_dir)
 	fname = file_path.name
 	entry = status.get(fname, {})
+	# Importado aqui para que `query` funcione sem GEMINI_API_KEY
+	from .gemini_client import extract_with_gemini, segment_text_into_questions
+
+	store = ResultsStore(out_dir)
+	exam = exam_hash(file_path)
 
 	# 1) Extrair texto completo
 	txt_path = out_dir / f"{file_path.stem}.txt"
@@ -157,7 +175,7 @@ def process_file(file_path: Path, out_dir: Path, jff_type: str = "fa", refresh:
 				if k in qr:
 					q[k] = qr[k]
 		# Saídas por questão
-		_write_per_question_outputs(file_path.stem, out_dir, q, jff_type, solved_subdir)
+		_write_per_question_outputs(file_path.stem, out_dir, q, jff_type, solved_subdir, store=store, exam=exam)
 		processed_questions.append(q)
 		# atualizar status
 		done_ids.add(qid)
@@ -174,14 +192,8 @@ def process_file(file_path: Path, out_dir: Path, jff_type: str = "fa", refresh:
 		write_fa_jff_file(consolidated, str(jff_out))
 
 
-def main() -> None:
-	parser = argparse.ArgumentParser(description="Extrair e processar questões")
-	parser.add_argument("--in", dest="inp", default=INPUT_DIR_DEFAULT)
-	parser.add_argument("--out", dest="out", default=OUTPUT_DIR_DEFAULT)
-	parser.add_argument("--type", dest="jff_type", default="fa", choices=["mealy", "fa", "moore", "dfa"])
-	parser.add_argument("--refresh", dest="refresh", action="store_true", help="Reexecuta do zero e ignora JSON prévio")
-	parser.add_argument("--solved-dir", dest="solved_dir", default="resolvidas", help="Subpasta de out/ para salvar JFFs por questão")
-	args = parser.parse_args()
+def _run(args: argparse.Namespace) -> None:
+	from .gemini_client import ROUTER
 
 	inp = Path(args.inp)
 	out = Path(args.out)
@@ -194,6 +206,87 @@ def main() -> None:
 		except Exception as e:
 			print(f"Erro ao processar {f.name}: {e}")
 
+	if ROUTER.hedger is not None:
+		st = ROUTER.hedger.stats()
+		print(
+			f"Hedging: {int(st['hedges_fired'])} disparados / {int(st['calls'])} chamadas, "
+			f"{int(st['hedges_won'])} vencidos pelo hedge, {int(st['hedges_skipped_budget'])} sem cota, "
+			f"{st['saved_seconds']:.1f}s de latência economizados"
+			+ (f" ({int(st['hedges_pending'])} originais ainda em andamento)" if st["hedges_pending"] else "")
+		)
+
+
+def _query(args: argparse.Namespace) -> int:
+	store = ResultsStore(Path(args.out))
+	if args.action == "get":
+		rec = store.get(args.exam, _sanitize_id(args.qid))
+		if rec is None:
+			print(f"Não encontrado: {args.exam} {args.qid}", file=sys.stderr)
+			return 1
+		value = rec["questao"].get(args.field) if args.field else rec
+		print(value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, indent=2))
+		return 0
+
+	records = list(store.iter_latest(args.exam))
+	if args.exam and not records:
+		print(f"Prova não encontrada: {args.exam}", file=sys.stderr)
+		return 1
+	if args.action == "export":
+		if args.fmt == "json":
+			text = json.dumps(records, ensure_ascii=False, indent=2) + "\n"
+		else:
+			text = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+		if args.output:
+			Path(args.output).write_text(text, encoding="utf-8")
+		else:
+			sys.stdout.write(text)
+		return 0
+
+	# regen: recria os arquivos por questão (.txt/.json/.jff) a partir do store
+	qid = _sanitize_id(args.qid) if args.qid else None
+	count = 0
+	for rec in records:
+		if qid and rec["id"] != qid:
+			continue
+		_write_per_question_outputs(
+			rec["stem"], store.out_dir, rec["questao"], rec.get("jff_type", "fa"), args.solved_dir,
+			answer_mode=rec.get("mode", ANSWER_MODE),
+		)
+		count += 1
+	print(f"{count} questões regeneradas em {store.out_dir}")
+	return 0
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Extrair e processar questões")
+	parser.add_argument("--in", dest="inp", default=INPUT_DIR_DEFAULT)
+	parser.add_argument("--out", dest="out", default=OUTPUT_DIR_DEFAULT)
+	parser.add_argument("--type", dest="jff_type", default="fa", choices=["mealy", "fa", "moore", "dfa"])
+	parser.add_argument("--refresh", dest="refresh", action="store_true", help="Reexecuta do zero e ignora JSON prévio")
+	parser.add_argument("--solved-dir", dest="solved_dir", default="resolvidas", help="Subpasta de out/ para salvar JFFs por questão")
+	sub = parser.add_subparsers(dest="command")
+
+	query = sub.add_parser("query", help="Consulta o results.ndjson indexado de uma pasta de saída")
+	query.add_argument("--out", dest="out", default=OUTPUT_DIR_DEFAULT)
+	actions = query.add_subparsers(dest="action", required=True)
+	get = actions.add_parser("get", help="Mostra o registro de uma questão")
+	get.add_argument("exam", help="Hash da prova ou nome do arquivo sem extensão")
+	get.add_argument("qid", help="ID da questão (ex.: Q1a)")
+	get.add_argument("--field", dest="field", default=None, help="Mostra só um campo da questão (ex.: resposta)")
+	export = actions.add_parser("export", help="Exporta as respostas mais recentes")
+	export.add_argument("exam", nargs="?", default=None, help="Hash ou nome da prova (padrão: todas)")
+	export.add_argument("--format", dest="fmt", default="ndjson", choices=["ndjson", "json"])
+	export.add_argument("--output", dest="output", default=None, help="Arquivo de saída (padrão: stdout)")
+	regen = actions.add_parser("regen", help="Regenera os arquivos por questão a partir do store")
+	regen.add_argument("exam", nargs="?", default=None, help="Hash ou nome da prova (padrão: todas)")
+	regen.add_argument("--qid", dest="qid", default=None)
+	regen.add_argument("--solved-dir", dest="solved_dir", default="resolvidas")
+	args = parser.parse_args()
+
+	if args.command == "query":
+		sys.exit(_query(args))
+	_run(args)
+
 
 if __name__ == "__main__":
 	main()
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+RESULTS_FILE = "results.ndjson"
+INDEX_FILE = "results.idx"
+
+
+def exam_hash(path: Path) -> str:
+	"""Identificador estável da prova: sha256 do conteúdo do arquivo (16 hex)."""
+	h = hashlib.sha256()
+	with open(path, "rb") as f:
+		for chunk in iter(lambda: f.read(1 << 20), b""):
+			h.update(chunk)
+	return h.hexdigest()[:16]
+
+
+class ResultsStore:
+	"""Armazena as respostas de uma pasta de saída em NDJSON append-only com índice de offsets.
+
+	Cada linha de `results.ndjson` é um registro por questão processada. `results.idx` guarda,
+	também em modo append, uma linha `exame<TAB>qid<TAB>offset<TAB>tamanho<TAB>stem` por registro;
+	ao abrir, o índice é carregado num dicionário (o registro mais recente de cada chave vence),
+	então cada consulta é um lookup + seek + leitura de uma linha. Se o índice ficar atrás do
+	NDJSON (ex.: interrupção entre as duas escritas), o trecho que falta é reindexado.
+	"""
+
+	def __init__(self, out_dir: Path) -> None:
+		self.out_dir = Path(out_dir)
+		self.data_path = self.out_dir / RESULTS_FILE
+		self.index_path = self.out_dir / INDEX_FILE
+		self._index: Dict[Tuple[str, str], Tuple[int, int]] = {}
+		self._stems: Dict[str, str] = {}
+		self._exams: Set[str] = set()
+		self._load_index()
+
+	def _add_to_index(self, exam: str, qid: str, offset: int, length: int, stem: str) -> None:
+		self._index[(exam, qid)] = (offset, length)
+		self._stems[stem] = exam
+		self._exams.add(exam)
+
+	def _load_index(self) -> None:
+		indexed_end = 0
+		if self.index_path.exists():
+			for line in self.index_path.read_text(encoding="utf-8").splitlines():
+				parts = line.split("\t")
+				if len(parts) != 5:
+					continue
+				exam, qid, offset, length, stem = parts
+				self._add_to_index(exam, qid, int(offset), int(length), stem)
+				indexed_end = max(indexed_end, int(offset) + int(length))
+		if self.data_path.exists() and self.data_path.stat().st_size > indexed_end:
+			self._reindex_from(indexed_end)
+
+	def _reindex_from(self, offset: int) -> None:
+		entries: List[str] = []
+		with open(self.data_path, "rb") as f:
+			f.seek(offset)
+			for raw in f:
+				length = len(raw)
+				if raw.endswith(b"\n"):
+					try:
+						rec = json.loads(raw)
+					except ValueError:
+						rec = None
+					if rec is not None:
+						self._add_to_index(rec["exam"], rec["id"], offset, length, rec.get("stem", ""))
+						entries.append(f"{rec['exam']}\t{rec['id']}\t{offset}\t{length}\t{rec.get('stem', '')}\n")
+				offset += length
+		if entries:
+			with open(self.index_path, "a", encoding="utf-8") as idx:
+				idx.writelines(entries)
+
+	def resolve_exam(self, exam_or_stem: str) -> Optional[str]:
+		"""Aceita o hash da prova ou o nome do arquivo sem extensão (stem)."""
+		if exam_or_stem in self._stems:
+			return self._stems[exam_or_stem]
+		if exam_or_stem in self._exams:
+			return exam_or_stem
+		return None
+
+	def append(self, exam: str, stem: str, qid: str, question: Dict[str, Any], **meta: Any) -> None:
+		record = {"exam": exam, "stem": stem, "id": qid, "ts": time.time(), **meta, "questao": question}
+		line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+		self.out_dir.mkdir(parents=True, exist_ok=True)
+		with open(self.data_path, "ab") as f:
+			offset = f.tell()
+			f.write(line)
+		with open(self.index_path, "a", encoding="utf-8") as idx:
+			idx.write(f"{exam}\t{qid}\t{offset}\t{len(line)}\t{stem}\n")
+		self._add_to_index(exam, qid, offset, len(line), stem)
+
+	def _read_at(self, f, offset: int, length: int) -> Dict[str, Any]:
+		f.seek(offset)
+		return json.loads(f.read(length))
+
+	def get(self, exam_or_stem: str, qid: str) -> Optional[Dict[str, Any]]:
+		exam = self.resolve_exam(exam_or_stem)
+		loc = self._index.get((exam, qid)) if exam else None
+		if loc is None:
+			return None
+		with open(self.data_path, "rb") as f:
+			return self._read_at(f, *loc)
+
+	def iter_latest(self, exam_or_stem: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+		"""Registros mais recentes de cada (prova, questão), na ordem em que foram gravados."""
+		exam = self.resolve_exam(exam_or_stem) if exam_or_stem else None
+		if exam_or_stem and exam is None:
+			return
+		locs = sorted(loc for (e, _), loc in self._index.items() if exam is None or e == exam)
+		if not locs:
+			return
+		with open(self.data_path, "rb") as f:
+			for loc in locs:
+				yield self._read_at(f, *loc)
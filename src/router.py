@@ -0,0 +1,275 @@
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import requests
+
+from .config import (
+	GEMINI_API_KEYS,
+	GEMINI_BASE_URLS,
+	GEMINI_MODELS_FAST,
+	GEMINI_MODELS_STRONG,
+	HEDGE_ENABLED,
+	HEDGE_MIN_SAMPLES,
+	HEDGE_PERCENTILE,
+	HEDGE_WINDOW,
+	RATE_LIMIT_PER_MINUTE,
+	ROUTER_COOLDOWN_SECONDS,
+	ROUTER_SHORT_CHARS,
+)
+from .hedging import Hedger, LatencyTracker
+
+TIER_FAST = "fast"
+TIER_STRONG = "strong"
+
+# Códigos HTTP que indicam problema do endpoint (cota, indisponibilidade, chave inválida)
+# e portanto justificam tentar o próximo endpoint em vez de falhar a chamada.
+FAILOVER_STATUS = {401, 403, 408, 429, 500, 502, 503, 504}
+
+
+class NoEndpointAvailable(RuntimeError):
+	pass
+
+
+class _SlidingWindowLimiter:
+	"""Limitador por endpoint: no máximo `calls` chamadas a cada `period` segundos."""
+
+	def __init__(self, calls: int, period: float = 60.0) -> None:
+		self.calls = calls
+		self.period = period
+		self._stamps: Deque[float] = deque()
+
+	def _purge(self, now: float) -> None:
+		while self._stamps and now - self._stamps[0] >= self.period:
+			self._stamps.popleft()
+
+	def wait_time(self, now: float) -> float:
+		self._purge(now)
+		if len(self._stamps) < self.calls:
+			return 0.0
+		return self.period - (now - self._stamps[0])
+
+	def record(self, now: float) -> None:
+		self._stamps.append(now)
+
+
+class Endpoint:
+	def __init__(self, base_url: str, api_key: str, model: str, tiers: Set[str], calls_per_minute: int) -> None:
+		self.base_url = base_url
+		self.api_key = api_key
+		self.model = model
+		# Um mesmo endpoint (mesma cota) pode atender aos dois tiers
+		self.tiers = set(tiers)
+		self.limiter = _SlidingWindowLimiter(calls_per_minute, 60.0)
+		# Saúde: falhas consecutivas e instante até o qual o endpoint fica fora do rodízio
+		self.failures = 0
+		self.down_until = 0.0
+		self.calls = 0
+		self.errors = 0
+
+	@property
+	def url(self) -> str:
+		return f"{self.base_url}/models/{self.model}:generateContent"
+
+	def is_healthy(self, now: float) -> bool:
+		return now >= self.down_until
+
+	def mark_success(self) -> None:
+		self.failures = 0
+		self.down_until = 0.0
+
+	def mark_failure(self, now: float, cooldown: float) -> None:
+		self.failures += 1
+		self.errors += 1
+		# Backoff exponencial do cooldown, limitado a 4x o cooldown base para não
+		# ultrapassar o timeout de uma chamada quando só há um endpoint
+		self.down_until = now + min(cooldown * (2 ** (self.failures - 1)), cooldown * 4)
+
+	def __repr__(self) -> str:
+		return f"Endpoint({'/'.join(sorted(self.tiers))}, {self.model}, {self.base_url}, key=...{self.api_key[-4:]})"
+
+
+class GeminiRouter:
+	"""Distribui chamadas entre várias chaves/modelos/URLs com limitador e saúde por endpoint.
+
+	Cada combinação (URL base, chave, modelo) é um endpoint independente. Questões curtas
+	ou simples vão para o tier `fast`; as demais para o tier `strong`. Se todos os endpoints
+	do tier estiverem fora do ar, usa o outro tier como reserva.
+	"""
+
+	def __init__(self, endpoints: List[Endpoint], cooldown: float = ROUTER_COOLDOWN_SECONDS, hedger: Optional[Hedger] = None) -> None:
+		if not endpoints:
+			raise ValueError("Nenhum endpoint configurado para o roteador.")
+		self.endpoints = endpoints
+		self.cooldown = cooldown
+		self.hedger = hedger
+		self._lock = threading.Lock()
+		self._rr = {tier: itertools.count() for tier in (TIER_FAST, TIER_STRONG)}
+		self._rr_fallback = {tier: itertools.count() for tier in (TIER_FAST, TIER_STRONG)}
+
+	@classmethod
+	def from_config(cls) -> "GeminiRouter":
+		endpoints: List[Endpoint] = []
+		by_ident: Dict[Tuple[str, str, str], Endpoint] = {}
+		for tier, models in ((TIER_FAST, GEMINI_MODELS_FAST), (TIER_STRONG, GEMINI_MODELS_STRONG)):
+			for base_url in GEMINI_BASE_URLS:
+				for key in GEMINI_API_KEYS:
+					for model in models:
+						# Mesma cota (URL, chave, modelo) em dois tiers: um único endpoint, com
+						# limitador e saúde compartilhados, que pertence aos dois tiers
+						ident = (base_url, key, model)
+						if ident in by_ident:
+							by_ident[ident].tiers.add(tier)
+							continue
+						endpoint = Endpoint(base_url, key, model, {tier}, RATE_LIMIT_PER_MINUTE)
+						by_ident[ident] = endpoint
+						endpoints.append(endpoint)
+		hedger = Hedger(LatencyTracker(HEDGE_WINDOW, HEDGE_MIN_SAMPLES), HEDGE_PERCENTILE) if HEDGE_ENABLED else None
+		return cls(endpoints, hedger=hedger)
+
+	@staticmethod
+	def choose_tier(text: str, answer_mode: str = "fa") -> str:
+		stripped = (text or "").strip()
+		if len(stripped) <= ROUTER_SHORT_CHARS:
+			return TIER_FAST
+		# Perguntas de uma linha no modo QA também são consideradas simples
+		if answer_mode == "qa" and "\n" not in stripped:
+			return TIER_FAST
+		return TIER_STRONG
+
+	def _candidates(self, tier: str) -> List[Endpoint]:
+		# Ordem de tentativa: tier pedido em rodízio, depois o outro tier (também em rodízio) como reserva
+		primary = [e for e in self.endpoints if tier in e.tiers]
+		fallback = [e for e in self.endpoints if tier not in e.tiers]
+		if primary:
+			start = next(self._rr[tier]) % len(primary)
+			primary = primary[start:] + primary[:start]
+		if fallback:
+			start = next(self._rr_fallback[tier]) % len(fallback)
+			fallback = fallback[start:] + fallback[:start]
+		return primary + fallback
+
+	def _acquire(self, tier: str, exclude: List[Endpoint], blocking: bool = True, deadline: Optional[float] = None) -> Optional[Endpoint]:
+		"""Reserva um slot no melhor endpoint saudável, esperando pelo limitador se preciso.
+
+		Se todos os candidatos estiverem em cooldown, espera o primeiro voltar, desde que isso
+		aconteça antes de `deadline`. Com `blocking=False` retorna None em vez de esperar.
+		"""
+		while True:
+			with self._lock:
+				now = time.monotonic()
+				candidates = [e for e in self._candidates(tier) if e not in exclude]
+				if not candidates:
+					return None
+				healthy = [e for e in candidates if e.is_healthy(now)]
+				if not healthy:
+					# Todos em cooldown: espera o primeiro a voltar, se couber no prazo
+					recovery = min(e.down_until for e in candidates)
+					if not blocking or (deadline is not None and recovery > deadline):
+						return None
+					wait = recovery - now
+				else:
+					best: Optional[Endpoint] = None
+					wait = float("inf")
+					for e in healthy:
+						w = e.limiter.wait_time(now)
+						if w < wait:
+							best, wait = e, w
+						if w == 0.0:
+							break
+					if best is not None and wait <= 0.0:
+						best.limiter.record(now)
+						best.calls += 1
+						return best
+					if not blocking:
+						return None
+			time.sleep(max(wait, 0.05))
+
+	def post(self, payload: Dict[str, Any], tier: str = TIER_STRONG, timeout: float = 120, kind: Optional[str] = None) -> Dict[str, Any]:
+		if self.hedger is None:
+			return self._post(payload, tier, timeout)
+		used: List[Endpoint] = []
+
+		def primary(cancel: threading.Event) -> Dict[str, Any]:
+			return self._post(payload, tier, timeout, cancel=cancel, used=used)
+
+		def make_hedge() -> Optional[Callable[[threading.Event], Dict[str, Any]]]:
+			# O hedge só sai se houver cota livre agora em um endpoint que a original ainda não usou
+			with self._lock:
+				snapshot = list(used)
+			endpoint = self._acquire(tier, snapshot, blocking=False)
+			if endpoint is None:
+				return None
+			return lambda cancel: self._post(payload, tier, timeout, cancel=cancel, first=endpoint)
+
+		return self.hedger.run(kind or tier, primary, make_hedge)
+
+	def _post(
+		self,
+		payload: Dict[str, Any],
+		tier: str,
+		timeout: float,
+		cancel: Optional[threading.Event] = None,
+		first: Optional[Endpoint] = None,
+		used: Optional[List[Endpoint]] = None,
+	) -> Dict[str, Any]:
+		"""Tenta os endpoints em ordem até um responder; para de tentar se `cancel` for sinalizado."""
+		tried: List[Endpoint] = []
+		last_error: Optional[Exception] = None
+		deadline = time.monotonic() + timeout
+		while True:
+			if cancel is not None and cancel.is_set():
+				raise NoEndpointAvailable("Requisição cancelada (hedge concorrente venceu).")
+			if first is not None:
+				endpoint, first = first, None
+			else:
+				endpoint = self._acquire(tier, tried, deadline=deadline)
+				if endpoint is None and tried:
+					# Todos já falharam nesta chamada: tenta de novo quando o primeiro sair do cooldown
+					endpoint = self._acquire(tier, [], deadline=deadline)
+			if endpoint is None:
+				break
+			tried.append(endpoint)
+			if used is not None:
+				with self._lock:
+					used.append(endpoint)
+			headers = {
+				"Content-Type": "application/json",
+				"X-goog-api-key": endpoint.api_key,
+			}
+			try:
+				resp = requests.post(endpoint.url, headers=headers, data=json.dumps(payload), timeout=timeout)
+			except requests.RequestException as e:
+				last_error = e
+				with self._lock:
+					endpoint.mark_failure(time.monotonic(), self.cooldown)
+				continue
+			if resp.status_code in FAILOVER_STATUS:
+				last_error = requests.HTTPError(f"{resp.status_code} em {endpoint!r}", response=resp)
+				with self._lock:
+					endpoint.mark_failure(time.monotonic(), self.cooldown)
+				continue
+			# Demais erros (ex.: 400) são do próprio pedido: não adianta trocar de endpoint
+			resp.raise_for_status()
+			with self._lock:
+				endpoint.mark_success()
+			return resp.json()
+		raise NoEndpointAvailable(f"Todos os endpoints falharam ou estão em cooldown (tier={tier}): {last_error}")
+
+	def stats(self) -> List[Dict[str, Any]]:
+		now = time.monotonic()
+		with self._lock:
+			return [
+				{
+					"tiers": sorted(e.tiers),
+					"model": e.model,
+					"base_url": e.base_url,
+					"calls": e.calls,
+					"errors": e.errors,
+					"healthy": e.is_healthy(now),
+				}
+				for e in self.endpoints
+			]
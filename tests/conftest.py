@@ -0,0 +1,57 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import pytest
+
+
+class StandIn:
+	"""Servidor HTTP local que imita o generateContent; `script` define status/atraso por chamada."""
+
+	def __init__(self, script: List[tuple]) -> None:
+		self.script = list(script)
+		self.calls = 0
+		stand_in = self
+
+		class Handler(BaseHTTPRequestHandler):
+			def log_message(self, *args) -> None:
+				pass
+
+			def do_POST(self) -> None:
+				self.rfile.read(int(self.headers.get("Content-Length", 0)))
+				idx = min(stand_in.calls, len(stand_in.script) - 1)
+				stand_in.calls += 1
+				status, delay = stand_in.script[idx]
+				time.sleep(delay)
+				body = json.dumps({"port": stand_in.port, "path": self.path}).encode("utf-8")
+				self.send_response(status)
+				self.send_header("Content-Type", "application/json")
+				self.send_header("Content-Length", str(len(body)))
+				self.end_headers()
+				self.wfile.write(body)
+
+		self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+		self.server.daemon_threads = True
+		self.port = self.server.server_address[1]
+		self.url = f"http://127.0.0.1:{self.port}"
+		threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+	def close(self) -> None:
+		self.server.shutdown()
+		self.server.server_close()
+
+
+@pytest.fixture
+def stand_ins():
+	servers: List[StandIn] = []
+
+	def make(script: List[tuple]) -> StandIn:
+		s = StandIn(script)
+		servers.append(s)
+		return s
+
+	yield make
+	for s in servers:
+		s.close()
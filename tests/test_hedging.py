@@ -0,0 +1,44 @@
+import time
+
+from src.hedging import Hedger, LatencyTracker
+from src.router import TIER_FAST, TIER_STRONG, Endpoint, GeminiRouter
+
+PAYLOAD = {"contents": [{"parts": [{"text": "Q1"}]}]}
+
+
+def _endpoint(url: str) -> Endpoint:
+	return Endpoint(url, "key-0000", "m", {TIER_FAST, TIER_STRONG}, 1000)
+
+
+def _hedged_router(endpoints) -> GeminiRouter:
+	tracker = LatencyTracker(window=50, min_samples=5)
+	for _ in range(10):
+		tracker.record(TIER_FAST, 0.05)
+	return GeminiRouter(endpoints, hedger=Hedger(tracker, pct=95))
+
+
+def test_hedge_wins_over_slow_primary(stand_ins):
+	slow = stand_ins([(200, 1.5)])
+	fast = stand_ins([(200, 0)])
+	router = _hedged_router([_endpoint(slow.url), _endpoint(fast.url)])
+	start = time.monotonic()
+	assert router.post(PAYLOAD, tier=TIER_FAST, timeout=5)["port"] == fast.port
+	assert time.monotonic() - start < 1
+	st = router.hedger.stats()
+	assert st["hedges_fired"] == 1 and st["hedges_won"] == 1
+	assert st["hedges_pending"] == 1 and st["saved_seconds"] > 0
+	# Quando a original termina, a economia é fechada e a amostra entra no percentil
+	time.sleep(1.5)
+	st = router.hedger.stats()
+	assert st["hedges_pending"] == 0
+	assert st["saved_seconds"] > 1
+	assert router.hedger.tracker.percentile(TIER_FAST, 100) > 1
+
+
+def test_no_hedge_to_the_same_endpoint(stand_ins):
+	slow = stand_ins([(200, 0.5)])
+	router = _hedged_router([_endpoint(slow.url)])
+	router.post(PAYLOAD, tier=TIER_FAST, timeout=5)
+	st = router.hedger.stats()
+	assert st["hedges_fired"] == 0 and st["hedges_skipped_budget"] == 1
+	assert slow.calls == 1
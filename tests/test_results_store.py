@@ -0,0 +1,39 @@
+from src.results_store import ResultsStore, exam_hash
+
+
+def test_append_get_and_latest_wins(tmp_path):
+	store = ResultsStore(tmp_path)
+	store.append("h1", "prova", "Q1", {"id": "Q1", "resposta": "a*"})
+	store.append("h1", "prova", "Q2", {"id": "Q2", "resposta": "b*"})
+	store.append("h1", "prova", "Q1", {"id": "Q1", "resposta": "(ab)*"})
+	assert store.get("h1", "Q1")["questao"]["resposta"] == "(ab)*"
+	assert store.get("prova", "Q2")["questao"]["resposta"] == "b*"
+	assert store.get("prova", "Q9") is None
+	assert store.get("outra", "Q1") is None
+
+	reopened = ResultsStore(tmp_path)
+	assert [r["id"] for r in reopened.iter_latest("prova")] == ["Q2", "Q1"]
+	assert reopened.get("h1", "Q1")["questao"]["resposta"] == "(ab)*"
+
+
+def test_missing_index_entries_are_rebuilt(tmp_path):
+	store = ResultsStore(tmp_path)
+	store.append("h1", "prova", "Q1", {"id": "Q1"})
+	store.append("h1", "prova", "Q2", {"id": "Q2"})
+	# Simula interrupção entre a escrita do NDJSON e a do índice
+	lines = store.index_path.read_text(encoding="utf-8").splitlines(keepends=True)
+	store.index_path.write_text(lines[0], encoding="utf-8")
+
+	reopened = ResultsStore(tmp_path)
+	assert reopened.get("h1", "Q2")["id"] == "Q2"
+	assert len(reopened.index_path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_exam_hash_depends_on_content(tmp_path):
+	a = tmp_path / "a.pdf"
+	b = tmp_path / "b.pdf"
+	a.write_bytes(b"prova 1")
+	b.write_bytes(b"prova 1")
+	assert exam_hash(a) == exam_hash(b)
+	b.write_bytes(b"prova 2")
+	assert exam_hash(a) != exam_hash(b)
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from src.router import TIER_FAST, TIER_STRONG, Endpoint, GeminiRouter, NoEndpointAvailable
+
+PAYLOAD = {"contents": [{"parts": [{"text": "Q1"}]}]}
+
+
+def _endpoint(url: str, tiers=(TIER_FAST, TIER_STRONG), model: str = "m") -> Endpoint:
+	return Endpoint(url, "key-0000", model, set(tiers), 1000)
+
+
+def test_failover_to_next_endpoint(stand_ins):
+	down = stand_ins([(503, 0)])
+	up = stand_ins([(200, 0)])
+	router = GeminiRouter([_endpoint(down.url), _endpoint(up.url)], cooldown=30)
+	for _ in range(3):
+		assert router.post(PAYLOAD, tier=TIER_FAST, timeout=5)["port"] == up.port
+	# O endpoint com falha fica em cooldown e não recebe mais chamadas
+	assert down.calls == 1
+	assert up.calls == 3
+
+
+def test_single_endpoint_recovers_after_cooldown(stand_ins):
+	flaky = stand_ins([(429, 0), (200, 0)])
+	router = GeminiRouter([_endpoint(flaky.url)], cooldown=0.3)
+	assert router.post(PAYLOAD, tier=TIER_FAST, timeout=5)["port"] == flaky.port
+	assert flaky.calls == 2
+
+
+def test_cooldown_longer_than_timeout_fails_fast(stand_ins):
+	down = stand_ins([(429, 0)])
+	router = GeminiRouter([_endpoint(down.url)], cooldown=60)
+	start = time.monotonic()
+	with pytest.raises(NoEndpointAvailable):
+		router.post(PAYLOAD, tier=TIER_FAST, timeout=1)
+	assert time.monotonic() - start < 1
+	assert down.calls == 1
+
+
+def test_tiers_route_to_their_models(stand_ins):
+	server = stand_ins([(200, 0)])
+	router = GeminiRouter([
+		_endpoint(server.url, (TIER_FAST,), model="flash"),
+		_endpoint(server.url, (TIER_STRONG,), model="pro"),
+	])
+	assert router.post(PAYLOAD, tier=TIER_FAST, timeout=5)["path"] == "/models/flash:generateContent"
+	assert router.post(PAYLOAD, tier=TIER_STRONG, timeout=5)["path"] == "/models/pro:generateContent"
+
+
+def test_shared_endpoints_rotate_for_both_tiers(stand_ins):
+	a = stand_ins([(200, 0)])
+	b = stand_ins([(200, 0)])
+	router = GeminiRouter([_endpoint(a.url), _endpoint(b.url)])
+	ports = {router.post(PAYLOAD, tier=TIER_STRONG, timeout=5)["port"] for _ in range(4)}
+	assert ports == {a.port, b.port}
+
+
+def test_choose_tier():
+	assert GeminiRouter.choose_tier("curta") == TIER_FAST
+	assert GeminiRouter.choose_tier("x" * 2000) == TIER_STRONG
+	assert GeminiRouter.choose_tier("x" * 2000, "qa") == TIER_FAST
+	assert GeminiRouter.choose_tier("x" * 2000 + "\nmais", "qa") == TIER_STRONG